@@ -6,8 +6,8 @@ from __future__ import annotations
 
 import argparse
 import contextlib
+import functools
 import importlib
-import runpy
 import sys
 import tempfile
 import typing as t
@@ -28,6 +28,7 @@ class BuildNamespace:
     working_dir: Path | None
     custody_cache: Path | None
     purge_dirs: bool | None
+    max_workers: int | None
 
     def __init__(self, settings: InputBuildSettings | None = None):
         if settings:
@@ -59,14 +60,14 @@ def _wrap_temp(path: Path | None):
             yield Path(temp_dir)
 
 
-def parse_settings_args(settings: InputBuildSettings | None = None, argv: list[str] | None = None, **kw):
-    """
-    Internal function used by `run_from_rules()` to combine an instance of
-    InputBuildSettings with CLI arguments to produce a BuildNamespace, which
-    can be easily turned into BuildSettings.
-    """
-    namespace = BuildNamespace(settings)
+def _positive_int(value: str):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, not {number}')
+    return number
 
+
+def _build_settings_parser(**kw):
     parser = argparse.ArgumentParser(**kw)
     parser.add_argument('-i', '--input',
                         help='input directory with raw files to process',
@@ -99,8 +100,38 @@ def parse_settings_args(settings: InputBuildSettings | None = None, argv: list[s
                         action=argparse.BooleanOptionalAction,
                         dest='purge_dirs',
                         default=None)
+    parser.add_argument('-j', '--jobs',
+                        help=('maximum number of files to process concurrently, for steps '
+                              'which support it; defaults to 1, processing files one at a time'),
+                        type=_positive_int,
+                        metavar='N',
+                        dest='max_workers',
+                        default=None)
 
-    return parser.parse_args(argv, namespace=namespace)
+    return parser
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_settings_parser(kw_items: tuple[tuple[str, t.Any], ...]):
+    return _build_settings_parser(**dict(kw_items))
+
+
+def parse_settings_args(settings: InputBuildSettings | None = None, argv: list[str] | None = None, **kw):
+    """
+    Internal function used by `run_from_rules()` to combine an instance of
+    InputBuildSettings with CLI arguments to produce a BuildNamespace, which
+    can be easily turned into BuildSettings.
+    """
+    key = tuple(sorted(kw.items()))
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable parser arguments; build a one-off parser instead.
+        parser = _build_settings_parser(**kw)
+    else:
+        parser = _cached_settings_parser(key)
+
+    return parser.parse_args(argv, namespace=BuildNamespace(settings))
 
 
 def run_from_rules(settings: InputBuildSettings | None,
@@ -111,12 +142,24 @@ def run_from_rules(settings: InputBuildSettings | None,
     """
     Build a new Context from Settings, Rules, and command line arguments. Then,
     execute a build using the new Context. A Custodian and a custom Context
-    class may be additionally supplied.
+    class may be additionally supplied. Returns the parsed settings.
     """
     final_settings = parse_settings_args(settings, **kw)
     with _wrap_temp(final_settings.working_dir) as working_dir:
         context = context_cls(final_settings.to_build_settings(working_dir), rules, custodian)
+        if final_settings.max_workers is not None:
+            context.max_workers = final_settings.max_workers
         context.run()
+    return final_settings
+
+
+# Style and format for a dependency line, keyed by whether the dependency is
+# satisfied, or None if it isn't needed.
+_DEP_STYLES: dict[bool | None, tuple[str | None, str]] = {
+    None: (None, '✓ {dep}'),
+    True: ('green', '✓ {dep}'),
+    False: ('red', '✗ {dep}: {dep.install_hint}'),
+}
 
 
 def pprint_step(step: t.Type[Step]):
@@ -145,17 +188,55 @@ def pprint_missing_deps(step: Step):
         style='red'
     )
     for dep in step.get_dependencies():
-        missing = False
-        if not dep.needed:
-            style = None
-        elif dep.satisfied:
-            style = 'green'
-        else:
-            missing = True
-            style = 'red'
+        style, fmt = _DEP_STYLES[bool(dep.satisfied) if dep.needed else None]
+        print_with_style(fmt.format(dep=dep), style=style)
 
-        text = f'✗ {dep}: {dep.install_hint}' if missing else f'✓ {dep}'
-        print_with_style(text, style=style)
+
+def _audit_steps(rules: list[Rule]):
+    """
+    Prettily display the available, unavailable, and used Steps for a list of
+    Rules.
+    """
+    # Classify every known Step in one pass, probing each only once and
+    # keeping a stable registry order in the output.
+    used_classes = {r.step.__class__ for r in rules if r.step}
+    available_steps: list[t.Type[Step]] = []
+    unavailable_steps: list[t.Type[Step]] = []
+    used_steps: list[t.Type[Step]] = []
+    for step in Step.get_all_steps():
+        (available_steps if step.is_available() else unavailable_steps).append(step)
+        if step in used_classes:
+            used_steps.append(step)
+
+    groups = {
+        'Available steps': available_steps,
+        'Unavailable steps': unavailable_steps,
+        'Used steps': used_steps,
+    }
+    for group_label, step_group in groups.items():
+        print(f'{group_label} ({len(step_group)})')
+        for step in step_group:
+            pprint_step(step)
+
+
+def _serve(port: int,
+           parsed_settings: BuildNamespace | None,
+           context: Context | None,
+           settings: InputBuildSettings | None,
+           argv: list[str]):
+    """
+    Serve the output directory of a project over HTTP.
+    """
+    from .server import serve
+    # Reuse the settings from the build if there was one, rather than
+    # building and running another parser. A CONTEXT carries its own.
+    if parsed_settings:
+        output_dir = parsed_settings.output_dir
+    elif context:
+        output_dir = context['output_dir']
+    else:
+        output_dir = parse_settings_args(settings, argv=argv).output_dir
+    serve(port, output_dir)
 
 
 def main(arguments: list[str] | None = None):
@@ -191,6 +272,8 @@ def main(arguments: list[str] | None = None):
 
     if args.config_file:
         label: str = str(args.config_file)
+        # runpy is only needed for config file paths, not -m.
+        import runpy
         namespace = runpy.run_path(label)
 
         settings: InputBuildSettings | None = namespace.get('SETTINGS')
@@ -204,32 +287,21 @@ def main(arguments: list[str] | None = None):
         custodian: Custodian | None = getattr(args.module, 'CUSTODIAN', None)
         context: Context | None = getattr(args.module, 'CONTEXT', None)
 
+    parsed_settings: BuildNamespace | None = None
     if args.audit_steps:
         audit_rules = context.rules if context else rules
         if not audit_rules:
             raise RuntimeError('Anchovy config files must have a RULES or CONTEXT attribute!')
-
-        all_steps = set(Step.get_all_steps())
-        available_steps = set(Step.get_available_steps())
-        unavailable_steps = all_steps - available_steps
-        used_steps = {r.step.__class__ for r in audit_rules if r.step}
-
-        groups = {
-            'Available steps': available_steps,
-            'Unavailable steps': unavailable_steps,
-            'Used steps': used_steps,
-        }
-        for group_label, step_group in groups.items():
-            print(f'{group_label} ({len(step_group)})')
-            for step in step_group:
-                pprint_step(step)
+        _audit_steps(audit_rules)
 
     elif context or rules:
         try:
             if context:
                 context.run()
             elif rules:
-                run_from_rules(settings, rules, custodian, argv=remaining, prog=f'anchovy {label}')
+                parsed_settings = run_from_rules(
+                    settings, rules, custodian, argv=remaining, prog=f'anchovy {label}'
+                )
         except StepUnavailableException as e:
             pprint_missing_deps(e.step)
             sys.exit(1)
@@ -243,6 +315,4 @@ def main(arguments: list[str] | None = None):
         sys.exit(1)
 
     if args.serve:
-        from .server import serve
-        parsed_settings = parse_settings_args(settings, argv=remaining)
-        serve(args.port, parsed_settings.output_dir)
+        _serve(args.port, parsed_settings, context, settings, remaining)
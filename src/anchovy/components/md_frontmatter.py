@@ -18,7 +18,6 @@ def simple_frontmatter_parser(content: str) -> dict:
             break
         meta[key.strip()] = value.strip()
 
-    print(meta, '...')
     return meta
 
 
@@ -16,6 +16,28 @@ if t.TYPE_CHECKING:
     from markdown_it.utils import EnvType, OptionsDict
 
 
+def _paragraph_closers(tokens: Sequence[Token], env: EnvType) -> dict[int, int]:
+    """
+    Map the index of each `paragraph_open` token to the index of its matching
+    `paragraph_close`. The map is built in one pass and kept in @env, so that
+    it is shared by every container in a document.
+    """
+    cached = env.get('_anchovy_paragraph_closers')
+    if cached and cached[0] is tokens:
+        return cached[1]
+
+    closers: dict[int, int] = {}
+    stack: list[int] = []
+    for i, token in enumerate(tokens):
+        if token.type == 'paragraph_open':
+            stack.append(i)
+        elif token.type == 'paragraph_close' and stack:
+            closers[stack.pop()] = i
+
+    env['_anchovy_paragraph_closers'] = (tokens, closers)
+    return closers
+
+
 def get_container_renderer(container_name: str, html_tag: str):
     """
     Factory function for markdown container renderers.
@@ -40,10 +62,7 @@ def get_container_renderer(container_name: str, html_tag: str):
             next_token = tokens[idx+1]
             if next_token.type == 'paragraph_open':
                 next_token.hidden = True
-                counter = idx + 2
-                while tokens[counter].type != 'paragraph_close' or tokens[counter].level != next_token.level:
-                    counter += 1
-                tokens[counter].hidden = True
+                tokens[_paragraph_closers(tokens, env)[idx+1]].hidden = True
 
         return self.renderToken(tokens, idx, _options, env)
 
@@ -4,16 +4,25 @@ Core classes and types for the Anchovy processing pipeline.
 from __future__ import annotations
 
 import abc
+import collections
+import itertools
+import operator
+import os
 import shutil
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from .custody import CustodyEntry, Custodian
-from .dependencies import Dependency
+from .dependencies import Dependency, clear_dependency_cache
 from .pretty_utils import track_progress
 
 if t.TYPE_CHECKING:
     from collections.abc import Sequence, Set
+    from concurrent.futures import Future
+
+    _ExplicitChain = tuple[Sequence[Path | CustodyEntry], list[Path]]
+    _PendingTask = tuple[Path, list[Path], bool, str, Future[_ExplicitChain | None] | None]
 
 
 T = t.TypeVar('T')
@@ -31,6 +40,7 @@ class InputBuildSettings(t.TypedDict, total=False):
     working_dir: Path | None
     custody_cache: Path | None
     purge_dirs: bool | None
+    max_workers: int | None
 
 class BuildSettings(t.TypedDict):
     """
@@ -44,45 +54,79 @@ class BuildSettings(t.TypedDict):
 
 
 def _rm_children(path: Path):
-    if not path.exists():
+    try:
+        entries = os.scandir(path)
+    except FileNotFoundError:
         return
-    for child in path.iterdir():
-        if child.is_dir():
-            shutil.rmtree(child)
-        else:
-            child.unlink()
+    with entries:
+        for entry in entries:
+            # Links are removed rather than followed; rmtree() refuses them.
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
 
 
-def _rm_orphans(path: Path, exclude: set[Path]):
-    if not path.exists():
+def _rm_orphans(path: Path, exclude: t.Iterable[Path]):
+    # Compare normalized strings rather than hashing a new Path per entry.
+    keep = {os.path.normcase(p) for p in exclude}
+    try:
+        root = os.scandir(path)
+    except FileNotFoundError:
         return False
-    removed_all = True
-    for child in path.iterdir():
-        if child in exclude:
-            removed_all = False
-            continue
-        if child.is_dir():
-            if _rm_orphans(child, exclude):
-                child.rmdir()
+
+    # Walk iteratively, post-order, so that directories can be removed once
+    # they've been emptied. A directory is kept if anything inside it was.
+    stack = [(root, os.fspath(path))]
+    kept: set[str] = set()
+    try:
+        while stack:
+            entries, dir_path = stack[-1]
+            for entry in entries:
+                if os.path.normcase(entry.path) in keep:
+                    kept.add(dir_path)
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append((os.scandir(entry.path), entry.path))
+                    break
+                else:
+                    os.unlink(entry.path)
             else:
-                removed_all = False
-        else:
-            child.unlink()
-    return removed_all
+                stack.pop()
+                entries.close()
+                if not stack:
+                    break
+                if dir_path in kept:
+                    kept.add(stack[-1][1])
+                else:
+                    os.rmdir(dir_path)
+    finally:
+        for entries, _ in stack:
+            entries.close()
+    return os.fspath(path) not in kept
 
 
 class Context:
     """
     A context and configuration class for building Anchovy projects.
     """
+    # Maximum number of concurrent tasks when running threadsafe Steps. The
+    # default of 1 runs every task serially, in planned order.
+    max_workers = 1
+
     def __init__(self,
                  settings: BuildSettings,
                  rules: list[Rule],
-                 custodian: Custodian | None = None):
+                 custodian: Custodian | None = None,
+                 max_workers: int | None = None):
         self.settings = settings
+        if max_workers is not None:
+            if max_workers < 1:
+                raise ValueError(f'max_workers must be at least 1, not {max_workers}')
+            self.max_workers = max_workers
         # Must set up the Custodian before the Rules so the Rules can install
         # checkers when they're bound.
         self.custodian = custodian or Custodian()
+        self._created_dirs: set[Path] = set()
         self.rules: list[Rule] = []
         for rule in rules:
             self.rules.append(rule)
@@ -106,17 +150,51 @@ class Context:
                 raise StepUnavailableException(step)
             step.bind(self)
 
+    def ensure_dir(self, path: Path):
+        """
+        Create a directory and any missing parents, skipping the syscalls if
+        it has already been ensured during this run. Because of this, Steps
+        must not remove directories during a run; one which has already been
+        ensured would not be created again.
+        """
+        if path not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path)
+
     def find_inputs(self, path: Path):
         """
         Overridable function to get paths to process based on a given @path.
         Default behavior is to recursively search for files but exclude the
         directories themselves.
         """
-        for candidate in path.iterdir():
-            if candidate.is_dir():
-                yield from self.find_inputs(candidate)
-            else:
-                yield candidate
+        if type(self).find_inputs is not Context.find_inputs:
+            # Overrides may prune or filter at any level, so they must still
+            # see every subdirectory.
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        yield from self.find_inputs(Path(entry.path))
+                    else:
+                        yield Path(entry.path)
+            return
+
+        # Walk with a stack of scandir() iterators instead of recursing, so
+        # that DirEntry's cached type information saves a stat() per entry.
+        # Directories are descended into as they're found, keeping the
+        # depth-first order of a recursive walk.
+        stack = [os.scandir(path)]
+        try:
+            while stack:
+                for entry in stack[-1]:
+                    if entry.is_dir():
+                        stack.append(os.scandir(entry.path))
+                        break
+                    yield Path(entry.path)
+                else:
+                    stack.pop().close()
+        finally:
+            for iterator in stack:
+                iterator.close()
 
     def match_paths(self, input_paths: list[Path]):
         """
@@ -127,28 +205,24 @@ class Context:
         tasks: dict[Step, list[tuple[Path, list[Path]]]]
         tasks = {r.step: [] for r in self.rules if r.step}
 
+        # Unpack the Rules once per call rather than once per path. None can
+        # be used in a Rule's path_calcs to halt further rule processing, so
+        # split each list at its first None ahead of time. This allows a
+        # single rule to both do processing and also halt further processing.
+        plan: list[tuple[Matcher, Step | None, list[PathCalc], bool]] = []
+        for rule in self.rules:
+            calcs = t.cast('list[PathCalc]', list(itertools.takewhile(bool, rule.path_calcs)))
+            plan.append((rule.matcher, rule.step, calcs, len(calcs) < len(rule.path_calcs)))
+
         for path in track_progress(input_paths, 'Planning...'):
-            for rule in self.rules:
-                if match := rule.matcher(self, path):
+            for matcher, step, calcs, halts in plan:
+                if match := matcher(self, path):
                     # None can be used to halt further rule processing.
-                    if not rule.step:
+                    if not step:
+                        break
+                    tasks[step].append((path, [calc(self, path, match) for calc in calcs]))
+                    if halts:
                         break
-                    output_paths: list[Path] = []
-                    for pathcalc in rule.path_calcs:
-                        # None can be used to halt further rule processing in
-                        # paths as well. This allows a single rule to both do
-                        # processing and also halt further processing.
-                        if not pathcalc:
-                            break
-                        output_paths.append(pathcalc(self, path, match))
-                    else:
-                        tasks[rule.step].append((path, output_paths))
-                        # We didn't break above, avoid the break below!
-                        continue
-                    tasks[rule.step].append((path, output_paths))
-                    # We need two breaks because we're trying to get out of the
-                    # surrounding for loop.
-                    break
 
         return tasks
 
@@ -156,37 +230,102 @@ class Context:
         """
         Process a set of files using the Context's defined rules. If
         @input_paths is empty or None, `self.find_inputs()` will be used to get
-        a tree of files to process. If intermediate files are produced,
-        `self.process()` will be called recursively with them.
+        a tree of files to process. If intermediate files are produced, they
+        will be processed in turn, round by round, until none remain.
         """
         input_paths = input_paths or list(self.find_inputs(self.settings['input_dir']))
 
-        tasks = self.match_paths(input_paths)
+        # Comparing strings is far cheaper than Path.is_relative_to(), which
+        # splits both paths into parts on every call. Paths are already
+        # normalized by pathlib, so a plain prefix test is equivalent once
+        # case is folded the way the platform's paths compare.
+        working_dir = os.path.normcase(self['working_dir'])
+        working_prefix = os.path.join(working_dir, '')
+
+        while input_paths:
+            # Several tasks may produce the same intermediate file; plan it
+            # only once per round, keeping first-seen order.
+            tasks = self.match_paths(list(dict.fromkeys(input_paths)))
+
+            # Stream tasks in planned order rather than copying them all into
+            # one list; only the count is needed up front, for the progress
+            # bar.
+            flattened = (
+                (step, p, ops)
+                for step, paths in tasks.items()
+                for p, ops in paths
+            )
+            total = sum(len(paths) for paths in tasks.values())
 
-        flattened: list[tuple[Step, Path, list[Path]]] = []
-        for step, paths in tasks.items():
-            flattened.extend((step, p, ops) for p, ops in paths)
+            further_processing: list[Path] = []
+            for output_paths in track_progress(self._run_tasks(flattened), 'Processing...', total):
+                for p in output_paths:
+                    p_str = os.path.normcase(p)
+                    if p_str.startswith(working_prefix) or p_str == working_dir:
+                        further_processing.append(p)
 
-        further_processing: list[Path] = []
-        for step, path, output_paths in track_progress(flattened, 'Processing...'):
-            stale, msg = self.custodian.refresh_needed(path, output_paths)
-            if stale:
-                explicit_chain = step(path, output_paths)
-                if explicit_chain:
-                    sources, output_paths = explicit_chain
-                else:
-                    sources = [path]
-                self.custodian.add_step(sources, output_paths, msg)
-            else:
-                output_paths = self.custodian.skip_step(path, output_paths)
+            input_paths = further_processing
 
-            further_processing.extend(
-                p for p in output_paths
-                if p.is_relative_to(self['working_dir'])
-            )
-
-        if further_processing:
-            self.process(further_processing)
+    def _run_tasks(self, flattened: t.Iterable[tuple[Step, Path, list[Path]]]):
+        """
+        Run each planned task whose outputs need a refresh, record it with the
+        Custodian, and yield its final output paths. If `self.max_workers`
+        allows, tasks for a threadsafe Step are run concurrently, but they are
+        always recorded in planned order so that custody records remain
+        deterministic.
+        """
+        executor: ThreadPoolExecutor | None = None
+        try:
+            for step, group in itertools.groupby(flattened, key=operator.itemgetter(0)):
+                if not step.threadsafe or self.max_workers == 1:
+                    for _step, path, output_paths in group:
+                        stale, msg = self.custodian.refresh_needed(path, output_paths)
+                        explicit_chain = step(path, output_paths) if stale else None
+                        yield self._record_task(path, output_paths, stale, msg, explicit_chain)
+                    continue
+
+                # Check staleness as each task is submitted rather than for
+                # the whole group up front, and keep at most max_workers tasks
+                # in flight.
+                executor = executor or ThreadPoolExecutor(self.max_workers)
+                pending: collections.deque[_PendingTask] = collections.deque()
+                for _step, path, output_paths in group:
+                    stale, msg = self.custodian.refresh_needed(path, output_paths)
+                    future = executor.submit(step, path, output_paths) if stale else None
+                    pending.append((path, output_paths, stale, msg, future))
+                    yield from self._record_pending(pending, self.max_workers - 1)
+                yield from self._record_pending(pending, 0)
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+    def _record_pending(self, pending: collections.deque[_PendingTask], keep: int):
+        """
+        Wait for and record the oldest pending tasks until only @keep remain,
+        yielding their final output paths.
+        """
+        while len(pending) > keep:
+            path, output_paths, stale, msg, future = pending.popleft()
+            yield self._record_task(path, output_paths, stale, msg, future.result() if future else None)
+
+    def _record_task(self,
+                     path: Path,
+                     output_paths: list[Path],
+                     stale: bool,
+                     msg: str,
+                     explicit_chain: _ExplicitChain | None):
+        """
+        Record a run or skipped task with the Custodian, returning its final
+        output paths.
+        """
+        if not stale:
+            return self.custodian.skip_step(path, output_paths)
+        if explicit_chain:
+            sources, output_paths = explicit_chain
+        else:
+            sources = [path]
+        self.custodian.add_step(sources, output_paths, msg)
+        return output_paths
 
     def run(self, input_paths: list[Path] | None = None):
         """
@@ -197,6 +336,7 @@ class Context:
         if self['purge_dirs']:
             _rm_children(self['output_dir'])
             _rm_children(self['working_dir'])
+        self._created_dirs.clear()
         self.custodian.bind(self)
         if cache_file := self['custody_cache']:
             self.custodian.load_file(cache_file)
@@ -214,11 +354,13 @@ class Matcher(t.Generic[T], abc.ABC):
     Abstract base class for Path Matchers. Provides pre-baked ability to
     combine Matchers with | and &.
     """
+    __slots__ = ()
+
     @abc.abstractmethod
     def __call__(self, context: Context, path: Path) -> T:
         ...
 
-    def __or__(self, other: Matcher[T2]):
+    def __or__(self, other: Matcher[T2]) -> Matcher[T | T2]:
         return _OrMatcher(self, other)
 
     def __and__(self, other: Matcher[T2]):
@@ -226,21 +368,41 @@ class Matcher(t.Generic[T], abc.ABC):
 
 
 class _OrMatcher(Matcher[T | T2]):
+    __slots__ = ('matchers',)
+
     def __init__(self, left: Matcher[T], right: Matcher[T2]):
-        self.left = left
-        self.right = right
+        # Chains like a | b | c are kept flat, so a call walks one loop
+        # instead of recursing through nested matchers.
+        self.matchers = _flatten_matchers(_OrMatcher, left, right)
 
     def __call__(self, context: Context, path: Path):
-        return self.left(context, path) or self.right(context, path)
+        for matcher in self.matchers[:-1]:
+            if result := matcher(context, path):
+                return result
+        return self.matchers[-1](context, path)
 
 
 class _AndMatcher(Matcher[T | T2]):
+    __slots__ = ('matchers',)
+
     def __init__(self, left: Matcher[T], right: Matcher[T2]):
-        self.left = left
-        self.right = right
+        self.matchers = _flatten_matchers(_AndMatcher, left, right)
 
     def __call__(self, context: Context, path: Path):
-        return self.left(context, path) and self.right(context, path)
+        for matcher in self.matchers[:-1]:
+            if not (result := matcher(context, path)):
+                return result
+        return self.matchers[-1](context, path)
+
+
+def _flatten_matchers(cls: type[_OrMatcher | _AndMatcher], *matchers: Matcher) -> tuple[Matcher, ...]:
+    flattened: list[Matcher] = []
+    for matcher in matchers:
+        if isinstance(matcher, cls):
+            flattened.extend(matcher.matchers)
+        else:
+            flattened.append(matcher)
+    return tuple(flattened)
 
 
 class PathCalc(t.Generic[T], abc.ABC):
@@ -248,16 +410,30 @@ class PathCalc(t.Generic[T], abc.ABC):
     Abstract base class for path calculators which use `Matcher` match data to
     determine output paths from input paths.
     """
+    __slots__ = ()
+
     @abc.abstractmethod
     def __call__(self, context: Context, path: Path, match: T) -> Path:
         ...
 
 
+class _ConstPathCalc(PathCalc[t.Any]):
+    __slots__ = ('path',)
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __call__(self, context: Context, path: Path, match: t.Any) -> Path:
+        return self.path
+
+
 class Rule(t.Generic[T]):
     """
     A single rule for Anchovy file processing, with a matcher, output path
     calculators, and an optional Step to run.
     """
+    __slots__ = ('matcher', 'step', 'path_calcs')
+
     def __init__(self,
                  matcher: Matcher[T],
                  path_calc: t.Sequence[PathCalc[T] | Path | None] | PathCalc[T] | Path | None,
@@ -269,10 +445,7 @@ class Rule(t.Generic[T]):
         self.path_calcs = [self._path_to_pathcalc(p) if isinstance(p, Path) else p for p in path_calc]
 
     def _path_to_pathcalc(self, path: Path):
-        # pylint: disable=unused-argument
-        def wrapper(context: Context, input_path: Path, match: t.Any):
-            return path
-        return wrapper
+        return _ConstPathCalc(path)
 
 
 class Step(abc.ABC):
@@ -282,6 +455,11 @@ class Step(abc.ABC):
     """
     context: Context
     _step_registry: list[t.Type[Step]] = []
+    # Whether calls for different paths can safely run concurrently. Steps
+    # which spend most of their time in subprocesses or GIL-releasing I/O
+    # benefit most.
+    threadsafe = False
+    _availability: dict[t.Type[Step], bool] = {}
 
     def __init_subclass__(cls, **kw):
         super().__init_subclass__(**kw)
@@ -305,9 +483,24 @@ class Step(abc.ABC):
     def is_available(cls) -> bool:
         """
         Return whether this Step's requirements are installed, making it
-        available for use.
+        available for use. The result is cached per Step class, since
+        installed requirements don't change during a build.
+        """
+        try:
+            return cls._availability[cls]
+        except KeyError:
+            available = cls._availability[cls] = all(d.satisfied for d in cls.get_dependencies())
+            return available
+
+    @classmethod
+    def refresh_availability(cls):
+        """
+        Forget cached availability for all Steps, along with cached dependency
+        checks, for when requirements have been installed since they were last
+        checked.
         """
-        return all(d.satisfied for d in cls.get_dependencies())
+        clear_dependency_cache()
+        cls._availability.clear()
 
     @classmethod
     def get_dependencies(cls) -> Set[Dependency]:
@@ -3,8 +3,10 @@ Explicit chain of custody management and intelligent rebuilds for Anchovy.
 """
 from __future__ import annotations
 
+import errno
 import hashlib
 import json
+import stat
 import typing as t
 from importlib.metadata import version
 from pathlib import Path
@@ -28,6 +30,10 @@ def checksum(path: Path, hashname: str = 'sha1', _bufsize=2**18):
     """
     if path.is_dir():
         return ''
+    return _file_checksum(path, hashname, _bufsize)
+
+
+def _file_checksum(path: Path, hashname: str = 'sha1', _bufsize=2**18):
     digest = hashlib.new(hashname)
 
     buf = bytearray(_bufsize)
@@ -46,6 +52,8 @@ class CustodyEntry:
     """
     Class holding custody info for a single input or output path.
     """
+    __slots__ = ('entry_type', 'key', 'meta')
+
     def __init__(self, entry_type: str, key: str, meta: dict | None = None):
         self.entry_type = entry_type
         self.key = key
@@ -87,12 +95,18 @@ class Custodian:
         self.meta: dict[str, tuple[str, _JsonDict]] = {}
         self.prior_meta: dict[str, tuple[str, _JsonDict]] = {}
 
+        # Input files don't change during a build, so their checksums only
+        # need to be calculated once even though they're checked and recorded
+        # repeatedly.
+        self._input_checksums: dict[Path, str] = {}
+
     def bind(self, context: 'Context'):
         """
         Bind this `Custodian` to a `Context` and update info using the
         `Context`'s settings.
         """
         self.context = context
+        self._input_checksums.clear()
         for key in context.settings:
             if key not in self.info:
                 self.info[key] = str(context.settings[key])
@@ -105,10 +119,12 @@ class Custodian:
         converting to a key.
         """
         for dir_key in CONTEXT_DIR_KEYS:
-            parent = self.context[dir_key]
-            if path.is_relative_to(parent):
-                path = dir_key / path.relative_to(parent)
-                break
+            try:
+                rel = path.relative_to(self.context[dir_key])
+            except ValueError:
+                continue
+            path = dir_key / rel
+            break
         return path.as_posix()
 
     def degenericize_path(self, key: str):
@@ -125,6 +141,13 @@ class Custodian:
         dir_key = t.cast('ContextDir', str(path.parents[-2]))
         return self.context[dir_key] / path.relative_to(dir_key)
 
+    def _path_checksum(self, path: Path):
+        if not path.is_relative_to(self.context['input_dir']):
+            return _file_checksum(path)
+        if path not in self._input_checksums:
+            self._input_checksums[path] = _file_checksum(path)
+        return self._input_checksums[path]
+
     def get_all_paths(self):
         """
         Generator of every output key in the graph as a Path.
@@ -140,8 +163,11 @@ class Custodian:
         # cost to also stat, and doing so means that an end user can switch to
         # m_time testing by registering a new checker and does not need to
         # subclass CustodyManager for this common case.
-        stat = path.stat()
-        meta = {'sha1': checksum(path), 'm_time': stat.st_mtime, 'size': stat.st_size}
+        # Reuse the stat result for the directory check rather than letting
+        # checksum() stat the path again.
+        path_stat = path.stat()
+        sha1 = '' if stat.S_ISDIR(path_stat.st_mode) else self._path_checksum(path)
+        meta = {'sha1': sha1, 'm_time': path_stat.st_mtime, 'size': path_stat.st_size}
         return CustodyEntry('path', self.genericize_path(path), meta)
 
     def check_path(self, entry: CustodyEntry) -> bool:
@@ -149,7 +175,19 @@ class Custodian:
         Default sha1-based checker for path staleness.
         """
         path = self.degenericize_path(entry.key)
-        return path.exists() and entry['sha1'] == checksum(path)
+        try:
+            path_stat = path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        except OSError as e:
+            # Like Path.exists(), treat a symlink loop as a missing path, but
+            # let other errors, such as a PermissionError, propagate.
+            if e.errno == errno.ELOOP:
+                return False
+            raise
+        if stat.S_ISDIR(path_stat.st_mode):
+            return entry['sha1'] == ''
+        return entry['sha1'] == self._path_checksum(path)
 
     def ensure_entry(self, record: Path | CustodyEntry):
         """
@@ -4,10 +4,35 @@ Dependency management for Anchovy Steps.
 from __future__ import annotations
 
 import abc
+import functools
 import importlib
 import shutil
 
 
+@functools.lru_cache(maxsize=None)
+def _is_importable(name: str) -> bool:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _is_on_path(name: str) -> bool:
+    return bool(shutil.which(name))
+
+
+def clear_dependency_cache():
+    """
+    Forget the cached results of dependency checks, so that packages or
+    executables installed since they were last checked will be found.
+    """
+    importlib.invalidate_caches()
+    _is_importable.cache_clear()
+    _is_on_path.cache_clear()
+
+
 class Dependency(abc.ABC):
     """
     A base class for trackable, evaluable, composable dependencies.
@@ -138,11 +163,7 @@ class PipDependency(Dependency):
         """
         A bool indicating whether this dependency is met.
         """
-        try:
-            importlib.import_module(self.check_name)
-        except ImportError:
-            return False
-        return True
+        return _is_importable(self.check_name)
 
     @property
     def install_hint(self):
@@ -172,7 +193,7 @@ class WebExecDependency(Dependency):
         """
         A bool indicating whether this dependency is met.
         """
-        return bool(shutil.which(self.check_name))
+        return _is_on_path(self.check_name)
 
     @property
     def install_hint(self):
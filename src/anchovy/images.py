@@ -19,6 +19,8 @@ class CWebPStep(BaseCommandStep):
     """
     A WebP image conversion/optimization Step using cwebp.
     """
+    threadsafe = True
+
     def __init__(self,
                  quality: int = 75,
                  lossless: bool = False,
@@ -49,6 +51,8 @@ class ImageMagickStep(BaseCommandStep):
     """
     A completely customizable image transformation Step using ImageMagick.
     """
+    threadsafe = True
+
     def __init__(self, options: t.Iterable[str] = ()):
         """
         If simple image conversion is desired, @options can be left empty.
@@ -102,6 +106,8 @@ class PillowStep(Step):
     """
     A simple Pillow step which can convert and/or thumbnail images.
     """
+    threadsafe = True
+
     def __init__(self, thumbnail: tuple[int, int] | None = None, transpose: bool = True):
         self.thumbnail = thumbnail
         self.transpose = transpose
@@ -126,10 +132,10 @@ class PillowStep(Step):
                 img.thumbnail(self.thumbnail)
 
             for first, *remainder in groups.values():
-                first.parent.mkdir(parents=True, exist_ok=True)
+                self.context.ensure_dir(first.parent)
                 img.save(first)
                 for dup in remainder:
-                    dup.parent.mkdir(parents=True, exist_ok=True)
+                    self.context.ensure_dir(dup.parent)
                     shutil.copy(first, dup)
 
 
@@ -137,6 +143,8 @@ class OptipngStep(BaseCommandStep):
     """
     A PNG optimization step using optipng.
     """
+    threadsafe = True
+
     def __init__(self,
                  optimization_level: int | None = None,
                  extra_options: t.Iterable[str] = ()):
@@ -29,11 +29,10 @@ def _to_dir_inner(dest: Path,
                   transform: t.Callable[[Path], Path] | None = None):
     path = _trim_ext_prefix(path, match) if ext and isinstance(match, re.Match) else path
 
-    rel = path.relative_to(
-        context['input_dir']
-        if path.is_relative_to(context['input_dir'])
-        else context['working_dir']
-    )
+    try:
+        rel = path.relative_to(context['input_dir'])
+    except ValueError:
+        rel = path.relative_to(context['working_dir'])
     if transform:
         rel = transform(rel)
     new_path = dest / rel
@@ -135,14 +134,51 @@ class REMatcher(Matcher[re.Match | None]):
     Paths; this can be used to avoid pitfalls with unexpected characters in
     input or working directories.
     """
+    __slots__ = ('regex', 'parent_dir')
+
     def __init__(self, re_string: str, re_flags: int = 0, parent_dir: ContextDir | None = None):
         self.regex = re.compile(re_string, re_flags)
         self.parent_dir: ContextDir | None = parent_dir
 
+    def __or__(self, other: Matcher[T]) -> Matcher[re.Match | None | T]:
+        if fused := self._fuse(other):
+            return t.cast(Matcher[re.Match | None | T], fused)
+        return super().__or__(other)
+
+    def _fuse(self, other: Matcher[t.Any]):
+        """
+        Combine this REMatcher with @other inside the regex engine, saving a
+        Python-level call and path conversion per test. Returns None if the two
+        can't be combined.
+        """
+        # Subclasses may match differently, so only fuse plain REMatchers.
+        if not isinstance(other, REMatcher) or {type(self), type(other)} != {REMatcher}:
+            return None
+        # Capturing groups would be renumbered (or, if named, clash), so only
+        # fuse patterns which have none.
+        if (
+            self.parent_dir != other.parent_dir
+            or self.regex.flags != other.regex.flags
+            or self.regex.flags & re.VERBOSE
+            or self.regex.groups or other.regex.groups
+        ):
+            return None
+        try:
+            return REMatcher(
+                f'(?:{self.regex.pattern})|(?:{other.regex.pattern})',
+                self.regex.flags,
+                self.parent_dir
+            )
+        except re.error:
+            # Most likely inline flags, which must start the pattern.
+            return None
+
     def __call__(self, context: Context, path: Path):
         if self.parent_dir:
-            # Handle this part of matching outside the regex.
-            if not path.is_relative_to(context[self.parent_dir]):
+            # Handle this part of matching outside the regex. relative_to()
+            # does the same work as is_relative_to(), so only call it once.
+            try:
+                path = path.relative_to(context[self.parent_dir])
+            except ValueError:
                 return None
-            path = path.relative_to(context[self.parent_dir])
         return self.regex.match(path.as_posix())
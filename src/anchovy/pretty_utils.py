@@ -25,18 +25,34 @@ except ImportError:
 T = t.TypeVar('T')
 
 
-def track_progress(iterable: t.Iterable[T], desc: str) -> t.Iterable[T]:
+def _track_rich(iterable: t.Iterable[T], desc: str, total: int | None = None) -> t.Iterable[T]:
+    return _rich_progress.track(  # type: ignore[reportOptionalMemberAccess]
+        iterable, desc, total=total, console=_rich_consoles['stdout']
+    )
+
+
+def _track_tqdm(iterable: t.Iterable[T], desc: str, total: int | None = None) -> t.Iterable[T]:
+    return _tqdm.tqdm(iterable, desc, total=total)  # type: ignore[reportOptionalMemberAccess]
+
+
+def _track_plain(iterable: t.Iterable[T], desc: str, total: int | None = None) -> t.Iterable[T]:
+    # pylint: disable=unused-argument
+    print(desc)
+    return iterable
+
+
+# Chosen once at import rather than re-checked, and re-yielded through, on
+# every call.
+_track_impl = _track_rich if _rich_progress else _track_tqdm if _tqdm else _track_plain
+
+
+def track_progress(iterable: t.Iterable[T], desc: str, total: int | None = None) -> t.Iterable[T]:
     """
     Progress tracker which supports rich and tqdm progress bars and gracefully
-    devolves to no progress tracking.
+    devolves to no progress tracking. @total should be supplied if @iterable
+    does not support `len()`.
     """
-    if _rich_progress:
-        yield from _rich_progress.track(iterable, desc, console=_rich_consoles['stdout'])
-    elif _tqdm:
-        yield from _tqdm.tqdm(iterable, desc)
-    else:
-        print(desc)
-        yield from iterable
+    return _track_impl(iterable, desc, total)
 
 
 def print_with_style(*args, sep=' ', end='\n', file: str = 'stdout', style=None):
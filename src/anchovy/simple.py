@@ -21,9 +21,11 @@ class DirectCopyStep(Step):
     A simple Step which only copies a file to the output directory without
     renaming or extension changes.
     """
+    threadsafe = True
+
     def __call__(self, path: Path, output_paths: list[Path]):
         for target_path in output_paths:
-            target_path.parent.mkdir(parents=True, exist_ok=True)
+            self.context.ensure_dir(target_path.parent)
             shutil.copy(path, target_path)
 
 
@@ -37,7 +39,7 @@ class BaseStandardStep(Step):
 
     def ensure_output_dirs(self, output_paths: list[Path]):
         for o_path in output_paths:
-            o_path.parent.mkdir(parents=True, exist_ok=True)
+            self.context.ensure_dir(o_path.parent)
 
     def duplicate_output_paths(self, output_paths: list[Path]):
         for o_path in output_paths[1:]:
@@ -74,7 +76,7 @@ class BaseCommandStep(Step):
         for egroup in self.group_outputs(output_paths):
             first = None
             for opath in egroup:
-                opath.parent.mkdir(parents=True, exist_ok=True)
+                self.context.ensure_dir(opath.parent)
                 if first:
                     shutil.copy(first, opath)
                 else:
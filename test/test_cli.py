@@ -0,0 +1,78 @@
+import argparse
+import pathlib
+
+import typing as t
+
+import pytest
+
+from anchovy import InputBuildSettings
+from anchovy.cli import main, parse_settings_args
+
+
+DATACLASS_CONFIG = '''
+from __future__ import annotations
+
+import dataclasses
+from pathlib import Path
+
+from anchovy import DirectCopyStep, InputBuildSettings, OutputDirPathCalc, REMatcher, Rule
+
+
+@dataclasses.dataclass
+class Options:
+    name: str = 'example'
+
+
+ROOT = Path(__file__).parent
+SETTINGS = InputBuildSettings(
+    input_dir=ROOT / 'site',
+    output_dir=ROOT / 'output',
+)
+RULES = [
+    Rule(REMatcher(r'.*'), [OutputDirPathCalc()], DirectCopyStep()),
+]
+'''
+
+
+def test_main_config_with_dataclass(tmp_path: pathlib.Path):
+    """
+    Config files are run as real modules, so module-introspecting code like
+    dataclasses works in them.
+    """
+    (tmp_path / 'site').mkdir()
+    (tmp_path / 'site' / 'index.html').write_text('hello')
+    config = tmp_path / 'config.py'
+    config.write_text(DATACLASS_CONFIG)
+
+    main([str(config)])
+
+    assert (tmp_path / 'output' / 'index.html').read_text() == 'hello'
+
+
+@pytest.mark.parametrize('argv, expected', [
+    ([], None),
+    (['-j', '1'], 1),
+    (['--jobs', '4'], 4),
+])
+def test_parse_settings_jobs(argv: list[str], expected: int | None):
+    assert parse_settings_args(None, argv=argv).max_workers == expected
+
+
+def test_parse_settings_jobs_invalid():
+    with pytest.raises(SystemExit):
+        parse_settings_args(None, argv=['-j', '0'])
+
+
+def test_parse_settings_parent_parser():
+    """
+    Project-specific CLIs can add their own arguments through parent parsers,
+    and extra settings keys are kept on the namespace.
+    """
+    extra_parser = argparse.ArgumentParser(add_help=False)
+    extra_parser.add_argument('--drafts', action='store_true')
+    settings = t.cast(InputBuildSettings, {'input_dir': pathlib.Path('site'), 'extra': 1})
+
+    parsed = parse_settings_args(settings, argv=['--drafts'], parents=[extra_parser])
+
+    assert vars(parsed)['drafts'] is True
+    assert vars(parsed)['extra'] == 1
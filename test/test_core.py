@@ -1,8 +1,10 @@
+import threading
 from pathlib import Path
 
 import pytest
 
 from anchovy.core import BuildSettings, Context, Matcher, PathCalc, Rule, Step
+from anchovy.dependencies import Dependency
 
 
 class DummyStep(Step):
@@ -90,3 +92,184 @@ def test_context_match_paths_stop_matching(build_settings: BuildSettings):
             (i_c, [o_c]),
         ],
     }
+
+
+class BarrierStep(Step):
+    threadsafe = True
+
+    def __init__(self, parties: int):
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def __call__(self, path: Path, output_paths: list[Path]):
+        # Deadlocks (and then raises) unless calls run concurrently.
+        self.barrier.wait()
+        for o_path in output_paths:
+            o_path.parent.mkdir(parents=True, exist_ok=True)
+            o_path.write_bytes(path.read_bytes())
+
+
+def test_context_process_threadsafe(build_settings: BuildSettings):
+    names = ['a', 'b', 'c']
+    build_settings['input_dir'].mkdir()
+    for name in names:
+        (build_settings['input_dir'] / name).write_text(name)
+
+    context = Context(build_settings, [
+        Rule(AllMatcher(), DummyPathCalc(), BarrierStep(len(names))),
+    ])
+    context.max_workers = len(names)
+    context.run()
+
+    for name in names:
+        assert (build_settings['output_dir'] / name).read_text() == name
+    # Custody is still recorded in planned order.
+    planned = context.find_inputs(build_settings['input_dir'])
+    assert list(context.custodian.graph) == [f'output_dir/{p.name}' for p in planned]
+
+
+class ThreadRecordingStep(Step):
+    threadsafe = True
+
+    def __init__(self):
+        self.threads: set[int] = set()
+
+    def __call__(self, path: Path, output_paths: list[Path]):
+        self.threads.add(threading.get_ident())
+        for o_path in output_paths:
+            o_path.parent.mkdir(parents=True, exist_ok=True)
+            o_path.write_bytes(path.read_bytes())
+
+
+def test_context_process_serial_by_default(build_settings: BuildSettings):
+    build_settings['input_dir'].mkdir()
+    for name in ['a', 'b', 'c']:
+        (build_settings['input_dir'] / name).write_text(name)
+
+    step = ThreadRecordingStep()
+    context = Context(build_settings, [
+        Rule(AllMatcher(), DummyPathCalc(), step),
+    ])
+    context.run()
+
+    assert step.threads == {threading.get_ident()}
+
+
+def test_context_max_workers_invalid(build_settings: BuildSettings):
+    with pytest.raises(ValueError):
+        Context(build_settings, [], max_workers=0)
+
+
+class DirMatcher(Matcher[Path]):
+    def __init__(self, key: str):
+        self.key = key
+
+    def __call__(self, context: Context, path: Path):
+        if path.is_relative_to(context[self.key]):
+            return path
+
+
+class CountingStep(Step):
+    def __init__(self):
+        self.calls: list[Path] = []
+
+    def __call__(self, path: Path, output_paths: list[Path]):
+        self.calls.append(path)
+        for o_path in output_paths:
+            o_path.parent.mkdir(parents=True, exist_ok=True)
+            o_path.write_text(path.name)
+
+
+def test_context_process_shared_intermediate(build_settings: BuildSettings):
+    build_settings['input_dir'].mkdir()
+    for name in ['a', 'b']:
+        (build_settings['input_dir'] / name).write_text(name)
+
+    merged = build_settings['working_dir'] / 'merged'
+    merge_step = CountingStep()
+    final_step = CountingStep()
+    context = Context(build_settings, [
+        Rule(DirMatcher('input_dir'), merged, merge_step),
+        Rule(DirMatcher('working_dir'), build_settings['output_dir'] / 'merged', final_step),
+    ])
+    context.run()
+
+    assert len(merge_step.calls) == 2
+    # Both inputs produced the same intermediate, but it's only processed once.
+    assert final_step.calls == [merged]
+
+
+class DraftlessContext(Context):
+    def find_inputs(self, path: Path):
+        if path.name == 'drafts':
+            return
+        yield from super().find_inputs(path)
+
+
+def test_context_find_inputs_override(build_settings: BuildSettings):
+    input_dir = build_settings['input_dir']
+    for name in ['a/y.md', 'a/drafts/x.md', 'b/drafts/c/z.md']:
+        (input_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        (input_dir / name).write_text(name)
+
+    context = DraftlessContext(build_settings, [])
+    # The override is consulted for every subdirectory, not just the top.
+    assert list(context.find_inputs(input_dir)) == [input_dir / 'a' / 'y.md']
+
+
+class ConstMatcher(Matcher[object]):
+    def __init__(self, value: object):
+        self.value = value
+
+    def __call__(self, context: Context, path: Path):
+        return self.value
+
+
+@pytest.mark.parametrize('values', [
+    (None, '', 'c'),
+    ('a', None, 'c'),
+    ('a', 'b', 'c'),
+    ('a', 'b', None),
+    (None, None, ''),
+])
+def test_matcher_combination(build_settings: BuildSettings, values: tuple[object, object, object]):
+    context = Context(build_settings, [])
+    path = build_settings['input_dir'] / 'a'
+    a, b, c = (ConstMatcher(v) for v in values)
+    va, vb, vc = values
+
+    assert (a | b | c)(context, path) == (va or vb or vc)
+    assert (a & b & c)(context, path) == (va and vb and vc)
+    assert ((a | b) & c)(context, path) == ((va or vb) and vc)
+    assert (a | (b & c))(context, path) == (va or (vb and vc))
+
+
+class ToggleDependency(Dependency):
+    def __init__(self):
+        self.installed = False
+
+    def __str__(self):
+        return 'toggle'
+
+    @property
+    def satisfied(self):
+        return self.installed
+
+    @property
+    def install_hint(self):
+        return ''
+
+
+def test_step_refresh_availability():
+    dependency = ToggleDependency()
+
+    class ToggleStep(DummyStep):
+        @classmethod
+        def get_dependencies(cls):
+            return {dependency}
+
+    assert not ToggleStep.is_available()
+    dependency.installed = True
+    # Availability is cached until explicitly refreshed.
+    assert not ToggleStep.is_available()
+    Step.refresh_availability()
+    assert ToggleStep.is_available()
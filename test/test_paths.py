@@ -111,3 +111,23 @@ def test_re_matcher(config: tuple, input: Path, expected: dict | None, dummy_con
         assert result.groupdict() == expected
     else:
         assert result is expected
+
+
+@pytest.mark.parametrize('left,right,fused', [
+    ((r'.*\.html',), (r'.*\.css',), True),
+    ((r'.*\.html', 0, 'input_dir'), (r'.*\.css', 0, 'input_dir'), True),
+    ((r'.*\.html', 0, 'input_dir'), (r'.*\.css', 0, 'working_dir'), False),
+    ((r'.*\.html',), (r'.*\.css', re.IGNORECASE), False),
+    ((r'.*(?P<ext>\.j\.html)',), (r'.*\.css',), False),
+    ((r'(?i).*\.html',), (r'.*\.css',), False),
+])
+def test_re_matcher_or(left: tuple, right: tuple, fused: bool, dummy_context: Context):
+    matcher = REMatcher(*left) | REMatcher(*right)
+    assert isinstance(matcher, REMatcher) is fused
+    for path in [INPUT_PATH / 'foo.html', INPUT_PATH / 'foo.css', INPUT_PATH / 'foo.js']:
+        separate = REMatcher(*left)(dummy_context, path) or REMatcher(*right)(dummy_context, path)
+        result = matcher(dummy_context, path)
+        if separate:
+            assert result and result.group() == separate.group()
+        else:
+            assert result is None